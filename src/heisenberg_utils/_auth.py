@@ -0,0 +1,14 @@
+import os
+from functools import lru_cache
+
+from google.oauth2 import service_account
+
+
+@lru_cache(maxsize=1)
+def get_credentials() -> service_account.Credentials:
+    """讀取並快取 service account 憑證，整個套件共用同一份。
+
+    BQ 與 GCS client 共用同一個 Credentials 物件，SA JSON 只解析一次、
+    只建立一個 signer，token 也只由一個狀態機負責刷新。
+    """
+    return service_account.Credentials.from_service_account_file(os.environ["GOOGLE_APPLICATION_CREDENTIALS"])
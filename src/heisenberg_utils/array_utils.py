@@ -2,11 +2,47 @@ import numba as nb
 import numpy as np
 from numpy.typing import NDArray
 
+# 超過這個長度才值得把 scatter 丟到多核心跑
+_PARALLEL_THRESHOLD = 1 << 16
+
+# 明確簽章讓 kernel 在 import 時就編譯，搭配 cache=True 把編譯結果
+# 存進 __pycache__，之後的 process 不用再付第一次呼叫的 JIT 延遲
+_ENCODE_SIGNATURES = [
+    nb.float64[:, :](nb.int64[:]),
+    nb.float64[:, :](nb.int32[:]),
+]
+_DECODE_SIGNATURES = [
+    nb.int32[:](nb.float64[:, :]),
+    nb.int32[:](nb.int64[:, :]),
+]
+
+
+@nb.njit(_ENCODE_SIGNATURES, cache=True, boundscheck=False)
+def _one_hot_encode_serial(array: NDArray[np.int_]) -> NDArray[np.float64]:
+    n = array.shape[0]
+    n_values = int(np.max(array) + 1)
+    out = np.zeros((n, n_values))
+    for i in range(n):
+        out[i, array[i]] = 1.0
+    return out
+
+
+@nb.njit(_ENCODE_SIGNATURES, cache=True, boundscheck=False, parallel=True)
+def _one_hot_encode_parallel(array: NDArray[np.int_]) -> NDArray[np.float64]:
+    n = array.shape[0]
+    n_values = int(np.max(array) + 1)
+    out = np.zeros((n, n_values))
+    for i in nb.prange(n):
+        out[i, array[i]] = 1.0
+    return out
+
 
-@nb.njit()
 def one_hot_encode_array(array: NDArray[np.int_]) -> NDArray[np.float64]:
     """將 numpy array 轉換成 one-hot encoding 的矩陣。
 
+    直接 scatter 到零矩陣，不會像 np.eye(n)[array] 先配置 O(n_values^2)
+    的單位矩陣再 gather；長陣列會自動切到平行版本。
+
     Examples
     ---
     >>> one_hot_encode_array(np.array([1, 2, 3, 4, 5, 1, 2, 3, 4, 5]))
@@ -18,14 +54,35 @@ def one_hot_encode_array(array: NDArray[np.int_]) -> NDArray[np.float64]:
         [0, 1, 0, 0],
     ])
     """
-    n_values = int(np.max(array) + 1)
-    return np.eye(n_values)[array]
+    if array.dtype.type not in {np.int32, np.int64}:
+        # 其他寬度（int16、int8、uint 等）先升成 int64，
+        # 不用為每種 dtype 都多編譯一份 kernel
+        array = array.astype(np.int64)
+    if array.shape[0] >= _PARALLEL_THRESHOLD:
+        return _one_hot_encode_parallel(array)
+    return _one_hot_encode_serial(array)
 
 
-@nb.njit()
-def one_hot_decode_array(array: NDArray[np.int_]) -> NDArray[np.int_]:
+@nb.njit(_DECODE_SIGNATURES, cache=True, boundscheck=False, parallel=True)
+def _one_hot_decode(array: NDArray[np.float64]) -> NDArray[np.int_]:
+    n, m = array.shape
+    out = np.empty(n, dtype=np.int32)
+    for i in nb.prange(n):
+        best = 0
+        for j in range(1, m):
+            if array[i, j] > array[i, best]:
+                best = j
+        out[i] = best
+    return out
+
+
+def one_hot_decode_array(array: NDArray[np.float64]) -> NDArray[np.int_]:
     """將 one-hot encoding 的矩陣轉換成原始的 array。
 
+    逐列的 argmax 在列之間彼此獨立，用 prange 讓所有核心分工處理；
+    輸出用 int32（類別數不會超過 int32 範圍），頻寬減半。
+    對 soft probability 矩陣也同樣適用。
+
     Examples
     ---
     >>> one_hot_decode_array(np.array([
@@ -35,19 +92,48 @@ def one_hot_decode_array(array: NDArray[np.int_]) -> NDArray[np.int_]:
         [1, 0, 0, 0],
         [0, 1, 0, 0],
     ]))
-    array([0, 2, 3, 0, 1])
+    array([0, 2, 3, 0, 1], dtype=int32)
     """
-    return np.argmax(array, axis=1)
+    if array.dtype.type not in {np.float64, np.int64}:
+        # float32、int32 等其他 dtype 先升成 float64 再比大小
+        array = array.astype(np.float64)
+    return _one_hot_decode(array)
 
 
-def normalize_array(array: NDArray[np.float64]) -> NDArray[np.float64]:
-    """Normalize array to sum to 1."""
-    total = array.sum()
+@nb.njit(cache=True, fastmath=True, parallel=True)
+def _normalize_flat(flat: NDArray[np.float64]) -> NDArray[np.float64]:
+    n = flat.shape[0]
+    total = 0.0
+    for i in nb.prange(n):
+        total += flat[i]
     if total == 0:
         raise ValueError("Sum is zero")
-    return array / total
+    inv = 1.0 / total
+    out = np.empty_like(flat)
+    for i in nb.prange(n):
+        out[i] = flat[i] * inv
+    return out
+
+
+def normalize_array(array: NDArray[np.float64]) -> NDArray[np.float64]:
+    """Normalize array to sum to 1.
+
+    Fused Numba kernel over the raveled values: one pass for the sum,
+    one for the reciprocal-multiply copy. Accepts any shape, like the
+    original numpy implementation.
+    """
+    flat = np.ascontiguousarray(array, dtype=np.float64).ravel()
+    return _normalize_flat(flat).reshape(array.shape)
 
 
+@nb.njit(cache=True, fastmath=True, parallel=True)
 def sum_col_array(array: NDArray[np.float64]) -> NDArray[np.float64]:
     """Sum over axis 0 (column-wise sum)."""
-    return array.sum(axis=0)
+    n, m = array.shape
+    out = np.empty(m)
+    for j in nb.prange(m):
+        total = 0.0
+        for i in range(n):
+            total += array[i, j]
+        out[j] = total
+    return out
@@ -1,21 +1,50 @@
 # pip3 install google-cloud-bigquery==3.29.0 google-cloud-bigquery-storage==2.28.0 db-dtypes==1.4.3 pyarrow==18.1.0
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
 import pandas as pd
 from google.cloud import bigquery
-from google.oauth2 import service_account
 from loguru import logger
 
+from ._auth import get_credentials
+
+try:
+    from google.cloud import bigquery_storage
+except ImportError:  # 未安裝 Storage API 時退回 REST 下載
+    bigquery_storage = None
+
 credentials_path = Path(os.getenv("GOOGLE_APPLICATION_CREDENTIALS", ""))
-BQ_CLIENT = bigquery.Client(credentials=service_account.Credentials.from_service_account_file(credentials_path))
 
 
-def estimate_query_size(query_script: str, bq_client: bigquery.Client=BQ_CLIENT) -> Optional[float]:
+@lru_cache(maxsize=1)
+def get_bq_client() -> bigquery.Client:
+    """取得共用的 BigQuery client，第一次呼叫時才建立。"""
+    return bigquery.Client(credentials=get_credentials())
+
+
+@lru_cache(maxsize=1)
+def get_bq_storage_client() -> "bigquery_storage.BigQueryReadClient":
+    """取得共用的 BigQuery Storage Read client（gRPC + Arrow，下載大表比 REST 快很多）。"""
+    return bigquery_storage.BigQueryReadClient(credentials=get_credentials())
+
+
+@lru_cache(maxsize=64)
+def _read_sql(script_path: Path, mtime_ns: int) -> str:
+    """讀取 SQL 腳本並以 (路徑, 修改時間) 為 key 快取。
+
+    參數化回補常會對同一個腳本重複查詢，快取讓重複呼叫不用再碰磁碟；
+    mtime_ns 進 key 則確保檔案一改就重新讀取。
+    """
+    return script_path.read_text(encoding="utf-8")
+
+
+def estimate_query_size(query_script: str, bq_client: Optional[bigquery.Client] = None) -> Optional[float]:
     """
     估算查詢的處理量，並印出預估結果，回傳預估處理量(MB)。
     """
+    bq_client = bq_client or get_bq_client()
     job = bq_client.query(query_script, job_config=bigquery.QueryJobConfig(dry_run=True))
     estimated_bytes = job.total_bytes_processed
 
@@ -36,7 +65,8 @@ def script_to_df(
     job_config: Optional[bigquery.QueryJobConfig] = None,
     is_confirm: bool = True,
     save_path: Optional[str|Path] = None,
-    bq_client: bigquery.Client = BQ_CLIENT,
+    bq_client: Optional[bigquery.Client] = None,
+    estimate: bool = True,
 ) -> pd.DataFrame:
     """
     將 BigQuery 查詢結果轉換為 DataFrame。
@@ -44,6 +74,7 @@ def script_to_df(
     Args
     ---
     query_script: BigQuery 查詢腳本
+    estimate: 是否先以 dry run 預估處理量（多一次 API 往返，非互動管線可關閉）
 
     Example
     ---
@@ -63,7 +94,9 @@ def script_to_df(
     )
     ```
     """
-    _ = estimate_query_size(query_script, bq_client)
+    bq_client = bq_client or get_bq_client()
+    if estimate and is_confirm:
+        _ = estimate_query_size(query_script, bq_client)
 
     if is_confirm:
         confirm = input("確定要執行查詢嗎？(Y/N): ").strip().upper()
@@ -72,9 +105,11 @@ def script_to_df(
             return pd.DataFrame()  # 回傳空 DataFrame
 
     try:
-        job = bq_client.query(query_script, job_config=job_config)
-        job.result()
-        df = job.to_dataframe()
+        rows = bq_client.query_and_wait(query_script, job_config=job_config)
+        if bigquery_storage is not None:
+            df = rows.to_dataframe(bqstorage_client=get_bq_storage_client(), create_bqstorage_client=False)
+        else:
+            df = rows.to_dataframe()
     except Exception as e:
         logger.error(f'執行查詢錯誤: {e}')
         logger.debug(f"bigquery_utils.py 憑證路徑: {credentials_path}")
@@ -92,7 +127,8 @@ def path_to_df(
     is_print: bool = False,
     is_confirm: bool = True,
     save_path: Optional[str|Path] = None,
-    bq_client: bigquery.Client = BQ_CLIENT,
+    bq_client: Optional[bigquery.Client] = None,
+    estimate: bool = True,
 ) -> pd.DataFrame:
     """
     讀取 SQL 腳本，並將查詢結果轉換為 DataFrame。
@@ -100,13 +136,21 @@ def path_to_df(
     Args:
     ---
     script_path: SQL 腳本路徑
+    estimate: 是否先以 dry run 預估處理量
     """
-    with open(script_path, encoding="utf-8") as file:
-        query_script = file.read()
+    script_path = Path(script_path)
+    query_script = _read_sql(script_path, os.stat(script_path).st_mtime_ns)
 
     if is_print:
         logger.info(query_script)
 
-    df = script_to_df(query_script, job_config, is_confirm, save_path, bq_client)
+    df = script_to_df(
+        query_script,
+        job_config=job_config,
+        is_confirm=is_confirm,
+        save_path=save_path,
+        bq_client=bq_client,
+        estimate=estimate,
+    )
 
     return df
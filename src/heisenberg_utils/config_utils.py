@@ -1,13 +1,24 @@
 import os
 import textwrap
-from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from functools import cache, lru_cache, partial
 from pathlib import Path
 from typing import Any
 
 import numpy as np
 import yaml
 from loguru import logger
-from matplotlib import rcParams
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # 沒安裝 libyaml 時退回純 Python loader
+    from yaml import SafeLoader as _YamlLoader
+
+
+@cache
+def _model_keys(cls: type) -> frozenset[str]:
+    """快取 Pydantic 模型的欄位名稱集合（model_fields 在類別建立後不會變動）。"""
+    return frozenset(cls.model_fields.keys())
 
 
 def filter_fields(source: dict, cls: type) -> dict:
@@ -23,8 +34,9 @@ def filter_fields(source: dict, cls: type) -> dict:
     ---
     dict: 僅包含 cls 中定義欄位的字典
     """
-    model_field_keys = cls.model_fields.keys()
-    return {k: v for k, v in source.items() if k in model_field_keys}
+    # 走訪來源字典而不是 key 集合的交集，保留原本的插入順序
+    keep = _model_keys(cls)
+    return {k: v for k, v in source.items() if k in keep}
 
 
 def build_from(config_obj: Any, cls: type) -> Any:
@@ -41,6 +53,8 @@ def build_from(config_obj: Any, cls: type) -> Any:
     ---
     Any: 建立好的 Pydantic 模型實例
     """
+    # 不做快取：Pydantic 模型預設是可變的，以 id 為 key 會在來源被
+    # 修改後回傳過期結果，也會把來源物件永遠留在記憶體裡
     return cls.model_validate(config_obj.model_dump())
 
 
@@ -73,7 +87,8 @@ def remove_keys(d: dict, keys: list[str]) -> dict:
     ---
     dict: 移除 key 後的字典
     """
-    return {k: v for k, v in d.items() if k not in keys}
+    drop = set(keys)
+    return {k: v for k, v in d.items() if k not in drop}
 
 
 def dict_diff_keys(d: dict, cls: type) -> list[str]:
@@ -89,8 +104,8 @@ def dict_diff_keys(d: dict, cls: type) -> list[str]:
     ---
     list[str]: 多出來的 key
     """
-    model_field_keys = cls.model_fields.keys()
-    return [k for k in d if k not in model_field_keys]
+    known = _model_keys(cls)
+    return [k for k in d if k not in known]
 
 
 def set_random_state(random_state: int=42) -> None:
@@ -101,23 +116,44 @@ def set_random_state(random_state: int=42) -> None:
     logger.debug(f'RANDOM_STATE 設定為: {random_state}')
 
 
+@lru_cache(maxsize=1)
+def _rng_for_state(random_state: int) -> np.random.Generator:
+    logger.debug(f'產生隨機數生成器，初始值為: {random_state}')
+    return np.random.default_rng(random_state)
+
+
 def get_rng() -> np.random.Generator:
     """根據環境變數 RANDOM_STATE 取得 numpy 的隨機數生成器。
 
     Note
     ---
     如果環境變數 RANDOM_STATE 未設定，則預設為 42。
+    同一個 RANDOM_STATE 會回傳同一個（共用的）generator，
+    不會每次呼叫都重新 seed。
     """
-    random_state = int(os.getenv('RANDOM_STATE', '42'))
+    return _rng_for_state(int(os.getenv('RANDOM_STATE', '42')))
 
-    logger.debug(f'產生隨機數生成器，初始值為: {random_state}')
 
-    return np.random.default_rng(random_state)
+def load_yaml(path: str) -> dict:
+    # 一次讀進 bytes 讓 C loader 直接解析，省掉 Python 層的逐塊讀取與解碼
+    return yaml.load(Path(path).read_bytes(), Loader=_YamlLoader)
 
 
-def load_yaml(path: str) -> dict:
-    with open(path, encoding="utf-8") as f:
-        return yaml.safe_load(f)
+def load_yamls(paths: list[str]) -> list[dict]:
+    """平行讀取多個 YAML 檔案。
+
+    YAML 解析是 CPU-bound，改用 process pool 讓多檔載入時間隨核心數下降。
+
+    Args
+    ---
+    paths (list[str]): YAML 檔案路徑列表
+
+    Returns
+    ---
+    list[dict]: 依照 paths 順序排列的解析結果
+    """
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        return list(executor.map(load_yaml, paths, chunksize=4))
 
 
 def wrap_field(value, indent=24, width=120) -> str:
@@ -143,6 +179,8 @@ def set_font(font_list: list[str]=['Arial Unicode MS', 'Noto Sans CJK TC', 'SimS
     ---
     font_list: 字體名稱列表
     """
+    from matplotlib import rcParams  # noqa: PLC0415  # matplotlib 啟動很慢，只在真的要設字體時才載入
+
     rcParams['font.sans-serif'] = font_list
     rcParams['axes.unicode_minus'] = True
     logger.debug(f'字體設定順序為 {font_list}')
@@ -1,5 +1,16 @@
 from collections.abc import Callable
-from functools import partial, reduce
+from functools import lru_cache, partial
+
+
+def _build_composed(funcs: tuple[Callable, ...]) -> Callable:
+    def composed(x):
+        for f in reversed(funcs):
+            x = f(x)
+        return x
+    return composed
+
+
+_compose_cached = lru_cache(maxsize=128)(_build_composed)
 
 
 def compose(*funcs: Callable) -> Callable:
@@ -13,10 +24,14 @@ def compose(*funcs: Callable) -> Callable:
     Returns
     ---
     A function that is the composition of the input functions.
+    The composed function runs a single loop over the pipeline instead
+    of a chain of nested closures, and the same funcs tuple returns the
+    same cached composition.
     """
-    def compose_two(f, g):
-        return lambda x: f(g(x))
-    return reduce(compose_two, funcs)
+    try:
+        return _compose_cached(funcs)
+    except TypeError:  # 有不可 hash 的 callable 時直接建構，不進快取
+        return _build_composed(funcs)
 
 
 def format_partial_object(p_obj: partial|Callable) -> str:
@@ -38,12 +53,23 @@ def format_partial_object(p_obj: partial|Callable) -> str:
         else:
             return str(p_obj)
 
-    func_name = p_obj.func.__name__
+    keywords = tuple((p_obj.keywords or {}).items())
+    try:
+        return _format_partial_cached(p_obj.func, p_obj.args, keywords)
+    except TypeError:  # 參數不可 hash 時直接格式化，不進快取
+        return _format_partial_parts(p_obj.func, p_obj.args, keywords)
 
-    args_list = [repr(arg) for arg in p_obj.args]
 
-    kwargs_list = [f"{k}={repr(v)}" for k, v in (p_obj.keywords or {}).items()]
+def _format_partial_parts(func: Callable, args: tuple, keywords: tuple) -> str:
+    func_name = func.__name__
+
+    args_list = [repr(arg) for arg in args]
+
+    kwargs_list = [f"{k}={repr(v)}" for k, v in keywords]
 
     all_args_str = ", ".join(args_list + kwargs_list)
 
     return f"{func_name}({all_args_str})"
+
+
+_format_partial_cached = lru_cache(maxsize=1024)(_format_partial_parts)
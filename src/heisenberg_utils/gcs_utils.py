@@ -1,23 +1,50 @@
 import os
 from datetime import timedelta
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional
 
 import requests
 from dotenv import load_dotenv
+from google.api_core.exceptions import NotFound
+from google.auth.transport.requests import AuthorizedSession
 from google.cloud import storage
-from google.oauth2 import service_account
 from loguru import logger
+from requests.adapters import HTTPAdapter, Retry
 
-load_dotenv()
-credentials_path = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
-gcs_client = storage.Client(credentials=service_account.Credentials.from_service_account_file(credentials_path))
+from ._auth import get_credentials
+
+# load_dotenv 會往上層目錄逐層找 .env，整個 process 做一次就夠了
+if not os.getenv("HEISENBERG_DOTENV_LOADED"):
+    load_dotenv()
+    os.environ["HEISENBERG_DOTENV_LOADED"] = "1"
+
+# 共用的 HTTP session：連線重用省去每次下載的 TCP+TLS 握手成本
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=Retry(total=3, backoff_factor=0.2)),
+)
+
+
+@lru_cache(maxsize=1)
+def get_gcs_client() -> storage.Client:
+    """取得共用的 GCS client，第一次呼叫時才建立。
+
+    預設 transport 的連線池很小，並行上傳/下載多個 blob 時會互相排隊，
+    因此這裡改掛 pool_maxsize=32 的 adapter。
+    """
+    credentials = get_credentials()
+    http = AuthorizedSession(credentials)
+    http.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=32))
+    return storage.Client(credentials=credentials, _http=http)
 
 
 def upload_to_gcs(
     bucket_name: str,
     local_file_path: str | Path,
     destination_blob_name: str | Path,
-    gcs_client: storage.Client=gcs_client,
+    gcs_client: Optional[storage.Client] = None,
 ) -> None:
     """
     將本地檔案上傳到 GCS Bucket（使用 service account）
@@ -40,6 +67,7 @@ def upload_to_gcs(
     )
     ```
     """
+    gcs_client = gcs_client or get_gcs_client()
     try:
         bucket = gcs_client.bucket(bucket_name)
         blob = bucket.blob(str(destination_blob_name))
@@ -55,7 +83,7 @@ def download_from_gcs(
     bucket_name: str,
     blob_name: str | Path,
     local_file_path: str | Path,
-    gcs_client: storage.Client=gcs_client,
+    gcs_client: Optional[storage.Client] = None,
 ) -> None:
     """
     從 GCS bucket 下載檔案到本地
@@ -78,6 +106,7 @@ def download_from_gcs(
     )
     ```
     """
+    gcs_client = gcs_client or get_gcs_client()
     try:
         bucket = gcs_client.bucket(bucket_name)
         blob = bucket.blob(str(blob_name))
@@ -93,27 +122,34 @@ def sync_gcs_file_to_local(
     bucket_name: str,
     gcs_blob_name: str | Path,
     local_file_path: str | Path,
-    gcs_client: storage.Client = gcs_client,
+    gcs_client: Optional[storage.Client] = None,
 ) -> bool:
     """
-    檢查 GCS 上的檔案是否存在，如果存在，則同步（下載）到本地。
-    這滿足了您不使用 try-except 來判斷存在性的需求。
+    如果 GCS 上的檔案存在，則同步（下載）到本地。
+    直接嘗試下載並攔截 NotFound，省去 blob.exists() 的一次額外 metadata RPC。
 
     Returns:
         bool: 如果檔案存在且成功下載，回傳 True；否則回傳 False。
     """
+    gcs_client = gcs_client or get_gcs_client()
+    local_file_path = Path(local_file_path)
+    # 先下載到暫存檔、成功後才改名覆蓋：遠端不存在或下載中斷時，
+    # 既有的本地檔案不會被截斷，也不會留下寫到一半的內容
+    tmp_path = local_file_path.with_name(local_file_path.name + '.part')
     try:
         bucket = gcs_client.bucket(bucket_name)
         blob = bucket.blob(str(gcs_blob_name))
 
-        if blob.exists():
-            logger.info(f"發現遠端檔案 gs://{bucket_name}/{gcs_blob_name}，正在同步至本地...")
-            download_from_gcs(bucket_name, gcs_blob_name, local_file_path, gcs_client)   # type: ignore
-            return True
-        else:
-            logger.info(f"遠端檔案 gs://{bucket_name}/{gcs_blob_name} 不存在，將在本地建立新檔案。")
-            return False
+        blob.download_to_filename(tmp_path)
+        tmp_path.replace(local_file_path)
+        logger.info(f"✅ 已同步遠端檔案：gs://{bucket_name}/{gcs_blob_name} → {local_file_path}")
+        return True
+    except NotFound:
+        tmp_path.unlink(missing_ok=True)
+        logger.info(f"遠端檔案 gs://{bucket_name}/{gcs_blob_name} 不存在，將在本地建立新檔案。")
+        return False
     except Exception as e:
+        tmp_path.unlink(missing_ok=True)
         logger.error(f"❌ 同步 GCS 檔案時發生錯誤：{e}")
         return False
 
@@ -121,20 +157,23 @@ def sync_gcs_file_to_local(
 def delete_from_gcs(
     bucket_name: str,
     blob_name: str | Path,
-    gcs_client: storage.Client = gcs_client,
+    gcs_client: Optional[storage.Client] = None,
 ) -> None:
-    """從 GCS Bucket 刪除一個物件。"""
+    """從 GCS Bucket 刪除一個物件。
+
+    直接嘗試刪除並攔截 NotFound，省去 blob.exists() 的一次額外 metadata RPC。
+    """
+    gcs_client = gcs_client or get_gcs_client()
     try:
         bucket = gcs_client.bucket(bucket_name)
         blob = bucket.blob(str(blob_name))
 
-        if not blob.exists():
-            logger.warning(f"⚠️ 嘗試刪除但檔案不存在：gs://{bucket_name}/{blob_name}")
-            return
-
         blob.delete()
         logger.info(f"✅ 檔案成功刪除：gs://{bucket_name}/{blob_name}")
 
+    except NotFound:
+        logger.warning(f"⚠️ 嘗試刪除但檔案不存在：gs://{bucket_name}/{blob_name}")
+
     except Exception as e:
         logger.error(f"❌ 刪除 GCS 檔案時發生錯誤：{e}")
 
@@ -143,7 +182,7 @@ def generate_signed_url(
     bucket_name: str,
     blob_name: str | Path,
     expiration_minutes: int = 15,
-    gcs_client: storage.Client=gcs_client,
+    gcs_client: Optional[storage.Client] = None,
 ) -> str:
     """
     生成簽名 URL，讓人可以下載 GCS 上的檔案。
@@ -166,6 +205,7 @@ def generate_signed_url(
     )
     ```
     """
+    gcs_client = gcs_client or get_gcs_client()
     bucket = gcs_client.bucket(bucket_name)
     blob = bucket.blob(str(blob_name))
 
@@ -198,11 +238,14 @@ def download_from_signed_url(signed_url: str, save_path: str | Path):
     )
     ```
     """
-    response = requests.get(signed_url)
-
-    if response.status_code == 200:
-        with open(save_path, 'wb') as f:
-            f.write(response.content)
-        logger.info(f"✅ 檔案已儲存至 {save_path}")
-    else:
-        logger.error(f"❌ 無法下載：{response.status_code} - {response.text}")
+    with _SESSION.get(signed_url, stream=True, timeout=60) as response:
+        if response.status_code != 200:  # noqa: PLR2004
+            logger.error(f"❌ 無法下載：{response.status_code} - {response.text}")
+            return
+
+        # 逐塊寫入磁碟，記憶體用量固定在 1 MiB，不會隨檔案大小成長
+        with open(save_path, 'wb', buffering=1 << 20) as f:
+            for chunk in response.iter_content(chunk_size=1 << 20):
+                f.write(chunk)
+
+    logger.info(f"✅ 檔案已儲存至 {save_path}")
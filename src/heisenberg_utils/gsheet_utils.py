@@ -1,24 +1,65 @@
+from __future__ import annotations
+
 import os
+import re
 import time
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-import pandas as pd
-import pygsheets
 from dotenv import load_dotenv
+from googleapiclient.errors import HttpError
 from loguru import logger
 
 from .config_utils import set_all_path
 from .decorators import safe_execution
 
-load_dotenv()
-set_all_path()
+if TYPE_CHECKING:
+    import pandas as pd
+
+# load_dotenv 會往上層目錄逐層找 .env，整個 process 做一次就夠了
+if not os.getenv("HEISENBERG_DOTENV_LOADED"):
+    load_dotenv()
+    os.environ["HEISENBERG_DOTENV_LOADED"] = "1"
 
-DATA_PATH = Path(os.environ["DATA_PATH"])
-SA_PATH = Path(os.environ["SA_PATH"])
 GOOGLE_APPLICATION_CREDENTIALS = os.getenv('GOOGLE_APPLICATION_CREDENTIALS')
 
 
+def _get_data_path() -> Path:
+    """延遲解析 DATA_PATH，避免在 import 階段就呼叫 set_all_path() 改動環境變數。"""
+    if "DATA_PATH" not in os.environ:
+        set_all_path()
+    return Path(os.environ["DATA_PATH"])
+
+
+_RETRYABLE_STATUS = (429, 503)
+
+
+def _col_letter(n: int) -> str:
+    """將 1-indexed 的欄位編號轉成 A1 標記的欄位字母（支援超過 Z，如 27 -> AA）。"""
+    letters = ''
+    while n > 0:
+        n, rem = divmod(n - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def _update_values_with_backoff(wk, range_name: str, values: list, max_retries: int = 6) -> None:
+    """呼叫 wk.update_values，遇到配額限制 (429/503) 時以指數退避重試。
+
+    只有真的被限流才等待，不用每批固定 sleep 浪費時間。
+    """
+    for attempt in range(max_retries):
+        try:
+            wk.update_values(range_name, values)
+            return
+        except HttpError as e:
+            if e.resp.status not in _RETRYABLE_STATUS or attempt == max_retries - 1:
+                raise
+            wait = min(0.2 * (2 ** attempt), 5)
+            logger.warning(f'Sheets API 回傳 {e.resp.status}，{wait:.1f} 秒後重試 ({attempt + 1}/{max_retries})')
+            time.sleep(wait)
+
+
 @safe_execution()
 def download_gsheet(
     url: str,
@@ -27,28 +68,33 @@ def download_gsheet(
     service_file=GOOGLE_APPLICATION_CREDENTIALS
 ) -> pd.DataFrame:
     """將Google Sheet下載為DataFrame。"""
+    import pygsheets  # noqa: PLC0415  # pygsheets 載入很慢，只在真的要存取 Sheets 時才付出
 
     def _remove_invisible_str(df: pd.DataFrame) -> pd.DataFrame:
-        return (df
-            .replace(r"[\s\u200B]+", " ", regex=True)
-            .apply(lambda x: x.str.strip() if x.dtype == "object" else x)
-            .copy()
-        )
+        # 只處理字串欄位，數值欄位不需要也不該跑 regex
+        obj_cols = df.select_dtypes(include="object").columns
+        if obj_cols.empty:
+            return df
+
+        pattern = re.compile(r"[\s\u200B]+")
+        cleaned = df.copy(deep=False)
+        cleaned[obj_cols] = df[obj_cols].apply(lambda s: s.str.replace(pattern, " ", regex=True).str.strip())
+        return cleaned
 
     gc = pygsheets.authorize(service_file=service_file)
     sht = gc.open_by_url(url)
     wk = sht.worksheet_by_title(sheet_name)
     df = wk.get_as_df()
 
+    # 直接在記憶體中清理，不需要先寫 CSV 再讀回來（舊寫法是為了繞過
+    # pygsheets 與 read_csv 的 dtype 推斷差異，清理後直接寫一次即可）
+    df = _remove_invisible_str(df)
+
     if save_path:
-        save_path = DATA_PATH / save_path
+        save_path = _get_data_path() / save_path
         df.to_csv(save_path, index=False)
         logger.info(f'資料已成功下載至{save_path}')
 
-        df = pd.read_csv(save_path)  # TODO: 不知為何讀完以後再刪除才不會出問題，找時間修正
-        df = _remove_invisible_str(df)
-        df.to_csv(save_path, index=False)
-
     return df
 
 
@@ -71,11 +117,14 @@ def upload_to_gsheet(
     Returns:
         bool: 上傳是否成功
     """
+    import pandas as pd  # noqa: PLC0415  # 延遲載入，讓沒用到上傳功能的 import 路徑保持輕量
+    import pygsheets  # noqa: PLC0415
+
     # 準備要上傳的DataFrame
     if df is not None:
         upload_df = df.copy()
     elif local_path:
-        full_path = DATA_PATH / local_path
+        full_path = _get_data_path() / local_path
         if not full_path.exists():
             logger.error(f'檔案不存在: {full_path}')
             return False
@@ -125,29 +174,29 @@ def upload_to_gsheet(
         num_batch = (total_rows + batch_size - 1) // batch_size
         logger.info(f'資料較大 ({total_rows} 行)，將分 {num_batch} 批上傳')
 
-        # 先寫入標題行
-        header_df = pd.DataFrame([upload_df.columns.tolist()], columns=upload_df.columns)
-        wk.set_dataframe(header_df, start='A1', copy_index=False, copy_head=False)
-
-        # 分批寫入資料
+        # 分批寫入資料；標題列直接併入第一批，省掉一次 set_dataframe 與 API 呼叫
+        last_col = _col_letter(data_cols)
+        header = [upload_df.columns.tolist()]
         for i in range(0, total_rows, batch_size):
-            batch_df = upload_df.iloc[i:i+batch_size].copy()
-            start_row = i + 2  # +2 because row 1 is header and rows are 1-indexed
+            batch_df = upload_df.iloc[i:i+batch_size]
 
-            # 計算結束行號
-            end_row = min(start_row + len(batch_df) - 1, data_rows)
+            # 將資料轉換為值列表（只讀取 slice，不需要先 copy）
+            values = batch_df.to_numpy(dtype=object, copy=False).tolist()
 
-            logger.info(f'上傳第 {i//batch_size + 1} 批資料 (行 {start_row} 到 {end_row})')
+            if i == 0:
+                values = header + values
+                start_row = 1
+            else:
+                start_row = i + 2  # +2 because row 1 is header and rows are 1-indexed
 
-            # 將資料轉換為值列表
-            values = batch_df.to_numpy().tolist()
+            # 計算結束行號
+            end_row = start_row + len(values) - 1
 
-            # 使用 update_values 方法批量寫入
-            range_name = f'A{start_row}:{chr(65 + data_cols - 1)}{end_row}'
-            wk.update_values(range_name, values)
+            logger.info(f'上傳第 {i//batch_size + 1} 批資料 (行 {start_row} 到 {end_row})')
 
-            # 避免API限制，稍微暫停
-            time.sleep(0.1)
+            # 使用 update_values 方法批量寫入，被限流時才退避重試
+            range_name = f'A{start_row}:{last_col}{end_row}'
+            _update_values_with_backoff(wk, range_name, values)
 
         logger.info(f'資料已成功分批上傳至 Google Sheet: {sheet_name} ({total_rows} 行資料')
 
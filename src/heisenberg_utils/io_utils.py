@@ -1,3 +1,4 @@
+import pickle
 from typing import Any, Literal
 
 import cloudpickle
@@ -15,6 +16,7 @@ def save_model(
     name: str,
     dump_method: Literal['joblib', 'cloudpickle'] = 'joblib',
     ext: str = "pkl",
+    compress: int | tuple = 0,
 ) -> None:
     """儲存模型到指定目錄與檔名。
 
@@ -24,6 +26,12 @@ def save_model(
     path: 儲存的資料夾路徑
     name: 模型檔名（不含副檔名）
     ext: 檔案格式（預設為 "pkl")
+    compress: joblib 的壓縮設定，預設 0（不壓縮，載入時才能 mmap）；
+        需要壓縮時可給 3 或 ('lz4', 3) 等
+
+    Note
+    ---
+    一律使用最高 pickle protocol，大型 numpy 陣列的序列化速度較快。
     """
     full_path = MODELS_PATH / path
     full_path.mkdir(parents=True, exist_ok=True)
@@ -31,14 +39,14 @@ def save_model(
 
     match dump_method:
         case 'joblib':
-            joblib.dump(model, file_path)
+            joblib.dump(model, file_path, compress=compress, protocol=pickle.HIGHEST_PROTOCOL)
         case 'cloudpickle':
             with open(file_path, "wb") as f:
-                cloudpickle.dump(model, f)
+                cloudpickle.dump(model, f, protocol=pickle.HIGHEST_PROTOCOL)
     logger.info(f"模型儲存至:\n{file_path}")
 
 
-def load_model(path: str, name: str, ext: str = "pkl") -> Any:
+def load_model(path: str, name: str, ext: str = "pkl", mmap: bool = False) -> Any:
     """從指定目錄載入模型。
 
     Args
@@ -46,6 +54,9 @@ def load_model(path: str, name: str, ext: str = "pkl") -> Any:
     path: 模型儲存目錄
     name: 模型檔名（不含副檔名）
     ext: 檔案格式（預設為 "pkl")
+    mmap: 是否以 mmap 模式載入（預設 False）。只適用於未壓縮的檔案，
+        大型陣列可以直接映射而不用整個讀進記憶體，但回傳的陣列是唯讀的；
+        壓縮檔或需要原地修改模型時請維持 False
 
     Returns
     ---
@@ -57,4 +68,4 @@ def load_model(path: str, name: str, ext: str = "pkl") -> Any:
     if not file_path.is_file():
         raise FileNotFoundError(f"Model file not found at {file_path}")
 
-    return joblib.load(file_path)
+    return joblib.load(file_path, mmap_mode='r' if mmap else None)
@@ -1,4 +1,10 @@
 # ruff: noqa: T203
+"""Loguru 相關工具的唯一正式版本。
+
+handler 只會在明確呼叫 start_log() 時安裝（它會先移除既有 handler），
+import 本模組不會註冊任何 sink——在 import 階段偷加 handler 會讓每個
+重複載入的副本都多寫一次檔案。
+"""
 import logging
 import os
 import sys
@@ -9,6 +15,15 @@ from typing import Optional
 
 from loguru import logger
 
+# 每筆被攔截的紀錄都要走 frame 比對，先把 logging 模組路徑存成常數
+_LOGGING_FILE = logging.__file__
+
+# 標準層級就這幾個，先查好 loguru 對應的層級名稱，emit 時只剩 dict lookup
+_LEVEL_NAME_CACHE = {
+    name: logger.level(name).name
+    for name in ("TRACE", "DEBUG", "INFO", "SUCCESS", "WARNING", "ERROR", "CRITICAL")
+}
+
 
 def show_handlers():
     """顯示目前的處理器。
@@ -32,12 +47,12 @@ def remove_stderr_handlers(id: Optional[int | str] = None, show_handlers: bool =
             是否在操作完成後顯示最新的處理器狀態。預設為 False。
     """
 
-    current_handlers = logger._core.handlers.copy()  # type: ignore
-    removed_count = 0
+    # 只做 membership 檢查，直接用 live dict 即可，不需要整份複製
+    current_handlers = logger._core.handlers  # type: ignore
 
     if id is None:
-        # 顯示當前處理器並讓用戶選擇
-        pprint(current_handlers)
+        # 顯示當前處理器並讓用戶選擇（顯示時才做快照）
+        pprint(current_handlers.copy())
 
         user_input = input("請輸入要移除的處理器 ID (多個用逗號分隔，如 1,2,3): ").strip()
 
@@ -56,15 +71,18 @@ def remove_stderr_handlers(id: Optional[int | str] = None, show_handlers: bool =
         # 單個 ID
         id_list = [id]
 
-    # 移除指定的處理器
+    # 先一次過濾出存在的 ID，再批次移除
+    valid_ids = [handler_id for handler_id in id_list if handler_id in current_handlers]
+
     for handler_id in id_list:
-        if handler_id in current_handlers:
-            logger.remove(handler_id)
-            removed_count += 1
-            logger.info(f"已移除處理器 ID: {handler_id}")
-        else:
+        if handler_id not in current_handlers:
             logger.info(f"處理器 ID {handler_id} 不存在")
 
+    for handler_id in valid_ids:
+        logger.remove(handler_id)
+        logger.info(f"已移除處理器 ID: {handler_id}")
+
+    removed_count = len(valid_ids)
     logger.info(f'總共移除了 {removed_count} 個處理器')
 
     # 如果需要顯示最新狀態
@@ -91,11 +109,17 @@ def start_log(level: str = "DEBUG", return_handlers: bool = False) -> Optional[t
     if not MAIN_PATH:
         raise OSError("環境變數 'MAIN_PATH' 未設定")
 
+    # enqueue=True 讓寫檔改走單一背景執行緒，呼叫端只做 queue append，
+    # 不用每筆訊息都搶 handler 鎖等磁碟 I/O
     file_handler_id = logger.add(
         Path(MAIN_PATH) / 'data' / 'log' / 'output.log',
         format="{time} {level} {message}",
         level=level,
-        rotation="1 week",
+        rotation="10 MB",  # 依實際寫入量輪替，burst 期間檔案不會無上限成長
+        retention=10,
+        compression="gz",  # 壓縮在 enqueue 的背景執行緒進行，不會卡住呼叫端
+        enqueue=True,
+        buffering=65536,
     )
 
     stderr_handler_id = logger.add(
@@ -124,13 +148,12 @@ def redirect_libraries_logging_to_loguru(log_level_map: dict[str, str]):
         一個將標準 logging 訊息重定向到 Loguru 的處理器。
         """
         def emit(self, record: logging.LogRecord) -> None:  # noqa: PLR6301
-            try:
-                level = logger.level(record.levelname).name
-            except ValueError:
-                level = record.levelno
+            level = _LEVEL_NAME_CACHE.get(record.levelname, record.levelno)
 
-            frame, depth = logging.currentframe(), 2
-            while frame and frame.f_code.co_filename == logging.__file__:
+            # sys._getframe() 與 logging.currentframe() 取到同一個 frame，
+            # 但少一層 logging 的屬性查找與 lambda 呼叫
+            frame, depth = sys._getframe(), 2
+            while frame and frame.f_code.co_filename == _LOGGING_FILE:
                 frame = frame.f_back
                 depth += 1
 
@@ -175,14 +198,21 @@ def redirect_libraries_logging_to_loguru(log_level_map: dict[str, str]):
 @contextmanager
 def suppress_stdout():
     """一個上下文管理器，可以暫時抑制(suppress)區塊內的標準輸出。
+
+    直接對 fd 1 做 dup2 重導向：連 C extension 或 subprocess 寫到
+    stdout 的內容也會被靜音，而且不用每次建立新的 Python 檔案物件。
     """
-    # 將當前的 stdout 保存起來
-    original_stdout = sys.stdout
-    # 在 try 區塊中，將 stdout 指向 os.devnull
+    sys.stdout.flush()
+    saved_fd = os.dup(1)
+    devnull_fd = os.open(os.devnull, os.O_WRONLY)
     try:
-        sys.stdout = open(os.devnull, 'w')  # noqa: PLW1514
+        os.dup2(devnull_fd, 1)
+        os.close(devnull_fd)
         yield
     # 無論如何，在 finally 區塊中確保恢復原始的 stdout
     finally:
-        sys.stdout.close()
-        sys.stdout = original_stdout
+        # 先把區塊內積在 Python buffer 的輸出沖到 devnull，
+        # 否則還原 fd 1 之後才 flush 會讓被抑制的內容漏出來
+        sys.stdout.flush()
+        os.dup2(saved_fd, 1)
+        os.close(saved_fd)
@@ -31,14 +31,16 @@ def generate_bootstrap_indices(
     else:
         n_size = len(data_idx)
 
-    train_idx_list = [
-        pd.Index(rng.choice(data_idx, int(n_size*(1-test_ratio)), replace=False))
-        for _ in range(replications)
-    ]
-
-    test_idx_list = [
-        pd.Index(data_idx).difference(train_idx)
-        for train_idx in train_idx_list
-    ]
-
-    return list(zip(train_idx_list, test_idx_list))
+    # 抽「位置」而非值，測試集用布林遮罩一次取補集：
+    # 比 pd.Index.difference（雜湊比對）或 np.setdiff1d（排序合併）都少一個
+    # O(n log n) 步驟，遮罩只要線性掃一遍
+    cut = int(n_size * (1 - test_ratio))
+    pairs = []
+    for _ in range(replications):
+        # 訓練集順序無關緊要，shuffle=False 省掉選取後的整段 Fisher-Yates
+        train_pos = rng.choice(n_size, cut, replace=False, shuffle=False)
+        mask = np.ones(n_size, dtype=bool)
+        mask[train_pos] = False
+        pairs.append((pd.Index(data_idx[train_pos]), pd.Index(data_idx[mask])))
+
+    return pairs
@@ -1,8 +1,17 @@
+from functools import lru_cache
+
+import numpy as np
 import pandas as pd
 
 from .sequence_utils import seq_intersect
 
 
+@lru_cache(maxsize=16)
+def _number_format(num_digits: int):
+    """回傳指定小數位數的格式化函數，每種位數只建構並解析一次格式字串。"""
+    return f"{{:,.{num_digits}f}}".format
+
+
 def format_number(df: pd.DataFrame, num_digits: int = 2) -> pd.DataFrame:
     """將 DataFrame 中的數字格式化為字串，保留小數點後 num_digits 位。
     支援普通欄位與 MultiIndex 欄位。
@@ -17,8 +26,15 @@ def format_number(df: pd.DataFrame, num_digits: int = 2) -> pd.DataFrame:
     df_formatted = df.copy()
     numeric_cols = df.select_dtypes(include="number").columns
 
+    # 直接對底層 ndarray 格式化，省掉 Series.map 每格的 pandas 呼叫開銷
+    fmt = _number_format(num_digits)
     for col in numeric_cols:
-        df_formatted[col] = df[col].map(lambda x: f"{x:,.{num_digits}f}" if pd.notna(x) else "")
+        arr = df[col].to_numpy()
+        mask = pd.isna(df[col]).to_numpy()
+        out = np.empty(arr.shape, dtype=object)
+        out[~mask] = [fmt(v) for v in arr[~mask]]
+        out[mask] = ""
+        df_formatted[col] = out
 
     return df_formatted
 
@@ -51,8 +67,10 @@ def drop_multicol(df: pd.DataFrame, cols: list[str]) -> pd.DataFrame:
     if not isinstance(df.columns, pd.MultiIndex):
         raise ValueError("DataFrame 欄位必須為 MultiIndex。")
 
-    to_drop = [col for col in df.columns if col[0] in cols or col[1] in cols]
-    return df.drop(columns=to_drop)
+    # 用 isin 對兩層欄位名稱做向量化比對，不用逐一走訪 column tuple
+    cols_set = set(cols)
+    mask = df.columns.get_level_values(0).isin(cols_set) | df.columns.get_level_values(1).isin(cols_set)
+    return df.loc[:, ~mask]
 
 
 def col_check_exist(col_list: list[str], df: pd.DataFrame) -> list[str]:
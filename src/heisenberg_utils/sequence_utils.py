@@ -6,7 +6,7 @@ T = TypeVar("T")
 
 
 def seq_intersect(a: Sequence[T], b: Sequence[T]) -> list[T]:
-    """回傳兩個序列的交集（無順序）。
+    """回傳 a 中也出現在 b 的元素（保留 a 的順序、去除重複）。
 
     原函數名為 col_intersect。
 
@@ -15,11 +15,12 @@ def seq_intersect(a: Sequence[T], b: Sequence[T]) -> list[T]:
     >>> seq_intersect(['a', 'b', 'c'], ['b', 'c', 'd'])
     ['b', 'c']
     """
-    return list(set(a) & set(b))
+    b_set = set(b)
+    return list(dict.fromkeys(x for x in a if x in b_set))
 
 
 def seq_difference(a: Sequence[T], b: Sequence[T]) -> list[T]:
-    """回傳在 a 中但不在 b 中的元素（無順序）。
+    """回傳在 a 中但不在 b 中的元素（保留 a 的順序、去除重複）。
 
     原函數名為 col_remove。
 
@@ -28,7 +29,8 @@ def seq_difference(a: Sequence[T], b: Sequence[T]) -> list[T]:
     >>> seq_difference(['a', 'b', 'c'], ['b', 'c', 'd'])
     ['a']
     """
-    return list(set(a) - set(b))
+    b_set = set(b)
+    return list(dict.fromkeys(x for x in a if x not in b_set))
 
 
 def seq_union(a: Sequence[T], b: Sequence[T]) -> list[T]: